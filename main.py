@@ -7,10 +7,24 @@ It initializes and runs the bot with all necessary handlers and configurations.
 """
 
 import logging
+import sys
+from importlib.util import find_spec
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.request import HTTPXRequest
 import os
 from dotenv import load_dotenv
 
+from utils.decorators import serialize_per_chat
+
+# Run the event loop on libuv when uvloop is available (not supported on Windows)
+if sys.platform != 'win32':
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
+
 # Load environment variables
 load_dotenv()
 
@@ -22,14 +36,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@serialize_per_chat
 async def start(update, context):
     """Send a message when the command /start is issued."""
-    await update.message.reply_text(
+    await update.effective_message.reply_text(
         "Welcome to Telegram Group Manager Bot! 🤖\n\n"
         "Use /help to see available commands."
     )
 
 
+@serialize_per_chat
 async def help_command(update, context):
     """Send a message when the command /help is issued."""
     help_text = """
@@ -40,12 +56,13 @@ Available Commands:
 
 For more information, visit our documentation.
     """
-    await update.message.reply_text(help_text)
+    await update.effective_message.reply_text(help_text)
 
 
+@serialize_per_chat
 async def info(update, context):
     """Send bot information."""
-    await update.message.reply_text(
+    await update.effective_message.reply_text(
         "Telegram Group Manager Bot v1.0\n\n"
         "A powerful bot for managing Telegram groups effectively."
     )
@@ -60,17 +77,62 @@ def main():
         logger.error("TELEGRAM_BOT_TOKEN environment variable not set!")
         raise ValueError("TELEGRAM_BOT_TOKEN environment variable not set!")
     
+    # Webhook mode needs a secret, otherwise anyone reaching the port could post forged updates
+    webhook_url = os.getenv('WEBHOOK_URL')
+    webhook_secret = os.getenv('WEBHOOK_SECRET')
+    if webhook_url and not webhook_secret:
+        logger.error("WEBHOOK_SECRET environment variable not set!")
+        raise ValueError("WEBHOOK_SECRET environment variable not set!")
+    
+    # Reuse pooled connections for API calls, over HTTP/2 when h2 is installed
+    http_version = "2" if find_spec("h2") else "1.1"
+    request = HTTPXRequest(
+        connection_pool_size=256,
+        read_timeout=35,
+        write_timeout=20,
+        http_version=http_version,
+    )
+    # The long-poll timeout is added to this request's read timeout per call
+    get_updates_request = HTTPXRequest(connection_pool_size=1, http_version=http_version)
+    
     # Create the Application
-    application = Application.builder().token(token).build()
+    application = (
+        Application.builder()
+        .token(token)
+        .request(request)
+        .get_updates_request(get_updates_request)
+        .concurrent_updates(256)
+        .build()
+    )
     
-    # Add command handlers
-    application.add_handler(CommandHandler("start", start))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("info", info))
+    # Add command handlers (non-blocking so a slow handler doesn't stall other chats)
+    application.add_handler(CommandHandler("start", start, block=False))
+    application.add_handler(CommandHandler("help", help_command, block=False))
+    application.add_handler(CommandHandler("info", info, block=False))
     
     # Start the Bot
     logger.info("Bot started successfully!")
-    application.run_polling(allowed_updates=["message", "edited_message"])
+    
+    # Let Telegram push updates when a public webhook URL is configured
+    if webhook_url:
+        application.run_webhook(
+            listen="0.0.0.0",
+            port=int(os.getenv('PORT', 8443)),
+            url_path=token,
+            webhook_url=f"{webhook_url.rstrip('/')}/{token}",
+            secret_token=webhook_secret,
+            allowed_updates=["message", "edited_message"],
+        )
+        return
+    
+    # Long-poll with no pause between requests; each getUpdates call returns
+    # up to Telegram's maximum of 100 updates (the library default limit)
+    application.run_polling(
+        poll_interval=0.0,
+        timeout=30,
+        bootstrap_retries=-1,
+        allowed_updates=["message", "edited_message"],
+    )
 
 
 if __name__ == '__main__':
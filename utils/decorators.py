@@ -5,21 +5,134 @@ This module provides decorators for Telegram bot handlers that enforce
 permission-based access control, authentication verification, and role-based authorization.
 """
 
+import asyncio
+from collections import namedtuple
 from functools import wraps
-from typing import Callable, Optional, List, Any
+from time import monotonic
+from typing import Callable, Dict, Optional, List, Any, Tuple
 import logging
 
 from telegram import Update
+from telegram.constants import CallbackQueryLimit
 from telegram.ext import ContextTypes
 
 logger = logging.getLogger(__name__)
 
+# Authenticated user stored in context.user_data["auth"] by require_authentication
+AuthContext = namedtuple("AuthContext", "user_id username")
+
+# Reply texts used by the decorators' denial paths
+_MSG_AUTH_FAIL = "❌ Authentication failed. Please try again."
+_MSG_NOT_AUTHORIZED = "❌ You are not authorized to perform this action."
+_MSG_NO_PERMISSION = "❌ You don't have permission to execute this command: `{}`"
+_MSG_ADMIN_UNVERIFIED = "❌ Unable to verify admin status."
+_MSG_NOT_ADMIN = "❌ You must be an admin to use this command."
+_MSG_ADMIN_ERROR = "❌ Error verifying admin status."
+_MSG_LEVEL_UNVERIFIED = "❌ Unable to verify access level."
+_MSG_LEVEL_REQUIRED = "❌ This action requires {} access level."
+_MSG_GROUP_ADMIN_UNVERIFIED = "❌ Could not verify group admin status."
+_MSG_GROUP_ONLY = "❌ This command can only be used in groups."
+_MSG_NOT_GROUP_ADMIN = "❌ You must be a group admin to use this command."
+_MSG_OWNER_UNVERIFIED = "❌ Could not verify ownership."
+_MSG_NOT_OWNER = "❌ Only the owner can execute this command."
+_MSG_NOT_CREATOR = "❌ Only the group creator can execute this command."
+_MSG_OWNER_ERROR = "❌ Error verifying ownership."
+_MSG_RATE_LIMITED = "⏳ You're sending too many requests. Please wait a moment."
+
+_LEVEL_NAMES = {0: "User", 1: "Moderator", 2: "Administrator", 3: "Super Admin"}
+
+# Keyword arguments for messages formatted as Markdown
+_MD = {"parse_mode": "Markdown"}
+
+# Markdown markers used in denial texts, removed for plain-text alerts.
+# Underscores are kept since permission names commonly contain them.
+_MD_MARKERS = str.maketrans("", "", "`*")
+
+# Seconds a cached chat member status stays valid
+ADMIN_CACHE_TTL = 60
+
+# Number of cached entries after which expired ones are pruned
+_ADMIN_CACHE_MAXSIZE = 4096
+
+# Chat member statuses keyed by (chat_id, user_id) -> (expires_at, status)
+_admin_cache: Dict[Tuple[int, int], Tuple[float, str]] = {}
+
+
+async def _get_member_status(context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_id: int) -> str:
+    """
+    Return the user's member status in a chat, using a short-lived cache.
+    
+    Shared by the admin, group admin and owner checks so repeated commands
+    don't issue a get_chat_member request every time.
+    
+    Args:
+        context: The handler context
+        chat_id: The chat to check
+        user_id: The user to check
+        
+    Returns:
+        The chat member status string (e.g. 'creator', 'administrator')
+    """
+    key = (chat_id, user_id)
+    now = monotonic()
+    cached = _admin_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    member = await context.bot.get_chat_member(chat_id, user_id)
+    
+    if len(_admin_cache) >= _ADMIN_CACHE_MAXSIZE:
+        for stale_key in [k for k, (expires_at, _) in _admin_cache.items() if expires_at <= now]:
+            del _admin_cache[stale_key]
+        if len(_admin_cache) >= _ADMIN_CACHE_MAXSIZE:
+            _admin_cache.clear()
+    
+    _admin_cache[key] = (now + ADMIN_CACHE_TTL, member.status)
+    return member.status
+
+
+async def _deny(update: Update, context: ContextTypes.DEFAULT_TYPE, text: str, **kwargs: Any) -> None:
+    """
+    Send a denial message for the update.
+    
+    Button presses are answered with an alert on the callback query,
+    with Markdown markers removed and the text truncated to fit. For
+    messages (new or edited) a silent plain message is sent to the chat
+    rather than a reply, since denials don't need to quote the triggering
+    message or notify the chat. Other updates are ignored.
+    
+    Args:
+        update: The incoming update
+        context: The handler context
+        text: The message text
+        **kwargs: Extra arguments for send_message (e.g. parse_mode)
+    """
+    query = update.callback_query
+    if query:
+        # Alerts are plain text and limited in length
+        if kwargs.get("parse_mode"):
+            text = text.translate(_MD_MARKERS)
+        limit = CallbackQueryLimit.ANSWER_CALLBACK_QUERY_TEXT_LENGTH
+        if len(text) > limit:
+            text = text[:limit - 1] + "…"
+        await query.answer(text, show_alert=True)
+        return
+    
+    message = update.effective_message
+    if not message:
+        return
+    await context.bot.send_message(
+        chat_id=message.chat_id, text=text, disable_notification=True, **kwargs
+    )
+
 
 def require_authentication(func: Callable) -> Callable:
     """
     Decorator to ensure the user is authenticated before executing the handler.
     
     This decorator checks if the user has a valid session or is registered in the system.
+    The user is made available to the handler as an AuthContext in
+    context.user_data["auth"].
     
     Args:
         func: The handler function to decorate
@@ -33,14 +146,15 @@ def require_authentication(func: Callable) -> Callable:
         
         if not user:
             logger.warning("Authentication failed: No user object found")
-            await update.message.reply_text("❌ Authentication failed. Please try again.")
+            await _deny(update, context, _MSG_AUTH_FAIL)
             return
         
-        # Store user_id for reference in the handler
-        context.user_data["authenticated_user_id"] = user.id
-        context.user_data["authenticated_user_username"] = user.username
+        # Store the user for reference in the handler, only rewriting it when it changes
+        auth = context.user_data.get("auth")
+        if auth is None or auth.user_id != user.id or auth.username != user.username:
+            context.user_data["auth"] = AuthContext(user.id, user.username)
         
-        logger.info(f"User {user.id} ({user.username}) authenticated successfully")
+        logger.debug("User %s (%s) authenticated successfully", user.id, user.username)
         return await func(update, context)
     
     return wrapper
@@ -56,6 +170,8 @@ def require_permission(permission: str) -> Callable:
     Returns:
         A decorator function
     """
+    denied_msg = _MSG_NO_PERMISSION.format(permission)
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
@@ -63,21 +179,18 @@ def require_permission(permission: str) -> Callable:
             
             if not user:
                 logger.warning("Permission check failed: No user object found")
-                await update.message.reply_text("❌ You are not authorized to perform this action.")
+                await _deny(update, context, _MSG_NOT_AUTHORIZED)
                 return
             
             # Check user permissions from context or database
             user_permissions = context.user_data.get("permissions", set())
             
             if permission not in user_permissions:
-                logger.warning(f"User {user.id} lacks required permission: {permission}")
-                await update.message.reply_text(
-                    f"❌ You don't have permission to execute this command: `{permission}`",
-                    parse_mode="Markdown"
-                )
+                logger.warning("User %s lacks required permission: %s", user.id, permission)
+                await _deny(update, context, denied_msg, **_MD)
                 return
             
-            logger.info(f"User {user.id} has permission: {permission}")
+            logger.info("User %s has permission: %s", user.id, permission)
             return await func(update, context)
         
         return wrapper
@@ -95,6 +208,9 @@ def require_permissions(permissions: List[str], require_all: bool = True) -> Cal
     Returns:
         A decorator function
     """
+    required_set = frozenset(permissions)
+    any_msg = f"❌ Requires one of: {', '.join(permissions)}"
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
@@ -102,30 +218,25 @@ def require_permissions(permissions: List[str], require_all: bool = True) -> Cal
             
             if not user:
                 logger.warning("Permission check failed: No user object found")
-                await update.message.reply_text("❌ You are not authorized to perform this action.")
+                await _deny(update, context, _MSG_NOT_AUTHORIZED)
                 return
             
-            user_permissions = context.user_data.get("permissions", set())
-            required_set = set(permissions)
-            user_set = set(user_permissions)
+            user_set = context.user_data.get("permissions") or frozenset()
             
             if require_all:
                 has_permission = required_set.issubset(user_set)
-                missing = required_set - user_set
-                error_msg = f"Missing permissions: {', '.join(missing)}"
+                if not has_permission:
+                    error_msg = f"❌ Missing permissions: {', '.join(required_set.difference(user_set))}"
             else:
-                has_permission = bool(required_set & user_set)
-                error_msg = f"Requires one of: {', '.join(permissions)}"
+                has_permission = not required_set.isdisjoint(user_set)
+                error_msg = any_msg
             
             if not has_permission:
-                logger.warning(f"User {user.id} permission check failed: {error_msg}")
-                await update.message.reply_text(
-                    f"❌ {error_msg}",
-                    parse_mode="Markdown"
-                )
+                logger.warning("User %s permission check failed: %s", user.id, error_msg)
+                await _deny(update, context, error_msg, **_MD)
                 return
             
-            logger.info(f"User {user.id} passed permission check")
+            logger.info("User %s passed permission check", user.id)
             return await func(update, context)
         
         return wrapper
@@ -147,25 +258,25 @@ def require_admin() -> Callable:
             
             if not user or not chat:
                 logger.warning("Admin check failed: No user or chat object found")
-                await update.message.reply_text("❌ Unable to verify admin status.")
+                await _deny(update, context, _MSG_ADMIN_UNVERIFIED)
                 return
             
             # Check if user is admin in the chat
             try:
-                member = await context.bot.get_chat_member(chat.id, user.id)
-                is_admin = member.status in ["creator", "administrator"]
+                status = await _get_member_status(context, chat.id, user.id)
+                is_admin = status in ["creator", "administrator"]
                 
                 if not is_admin:
-                    logger.warning(f"User {user.id} is not an admin in chat {chat.id}")
-                    await update.message.reply_text("❌ You must be an admin to use this command.")
+                    logger.warning("User %s is not an admin in chat %s", user.id, chat.id)
+                    await _deny(update, context, _MSG_NOT_ADMIN)
                     return
                 
-                logger.info(f"User {user.id} is admin in chat {chat.id}")
+                logger.info("User %s is admin in chat %s", user.id, chat.id)
                 return await func(update, context)
             
             except Exception as e:
-                logger.error(f"Error checking admin status: {e}")
-                await update.message.reply_text("❌ Error verifying admin status.")
+                logger.error("Error checking admin status: %s", e)
+                await _deny(update, context, _MSG_ADMIN_ERROR)
                 return
         
         return wrapper
@@ -188,6 +299,8 @@ def require_access_level(level: int) -> Callable:
     Returns:
         A decorator function
     """
+    denied_msg = _MSG_LEVEL_REQUIRED.format(_LEVEL_NAMES.get(level, "Unknown"))
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
@@ -195,22 +308,18 @@ def require_access_level(level: int) -> Callable:
             
             if not user:
                 logger.warning("Access level check failed: No user object found")
-                await update.message.reply_text("❌ Unable to verify access level.")
+                await _deny(update, context, _MSG_LEVEL_UNVERIFIED)
                 return
             
             # Get user's access level from context data
             user_level = context.user_data.get("access_level", 0)
             
             if user_level < level:
-                level_names = {0: "User", 1: "Moderator", 2: "Administrator", 3: "Super Admin"}
-                required_name = level_names.get(level, "Unknown")
-                logger.warning(f"User {user.id} access denied: requires level {level}")
-                await update.message.reply_text(
-                    f"❌ This action requires {required_name} access level."
-                )
+                logger.warning("User %s access denied: requires level %s", user.id, level)
+                await _deny(update, context, denied_msg)
                 return
             
-            logger.info(f"User {user.id} passed access level check (level: {user_level})")
+            logger.info("User %s passed access level check (level: %s)", user.id, user_level)
             return await func(update, context)
         
         return wrapper
@@ -234,30 +343,30 @@ def require_group_admin(func: Callable) -> Callable:
         
         if not user or not chat:
             logger.warning("Group admin check failed: Invalid user or chat object")
-            await update.message.reply_text("❌ Could not verify group admin status.")
+            await _deny(update, context, _MSG_GROUP_ADMIN_UNVERIFIED)
             return
         
         # Check if this is a group
         if chat.type not in ["group", "supergroup"]:
-            logger.warning(f"Command used in non-group chat: {chat.type}")
-            await update.message.reply_text("❌ This command can only be used in groups.")
+            logger.warning("Command used in non-group chat: %s", chat.type)
+            await _deny(update, context, _MSG_GROUP_ONLY)
             return
         
         try:
-            member = await context.bot.get_chat_member(chat.id, user.id)
-            is_admin = member.status in ["creator", "administrator"]
+            status = await _get_member_status(context, chat.id, user.id)
+            is_admin = status in ["creator", "administrator"]
             
             if not is_admin:
-                logger.warning(f"User {user.id} is not an admin in group {chat.id}")
-                await update.message.reply_text("❌ You must be a group admin to use this command.")
+                logger.warning("User %s is not an admin in group %s", user.id, chat.id)
+                await _deny(update, context, _MSG_NOT_GROUP_ADMIN)
                 return
             
-            logger.info(f"User {user.id} verified as group admin in {chat.id}")
+            logger.info("User %s verified as group admin in %s", user.id, chat.id)
             return await func(update, context)
         
         except Exception as e:
-            logger.error(f"Error verifying group admin: {e}")
-            await update.message.reply_text("❌ Error verifying admin status.")
+            logger.error("Error verifying group admin: %s", e)
+            await _deny(update, context, _MSG_ADMIN_ERROR)
             return
     
     return wrapper
@@ -281,30 +390,30 @@ def require_owner(owner_id: Optional[int] = None) -> Callable:
             
             if not user:
                 logger.warning("Owner check failed: No user object found")
-                await update.message.reply_text("❌ Could not verify ownership.")
+                await _deny(update, context, _MSG_OWNER_UNVERIFIED)
                 return
             
             # If specific owner_id is provided, check against it
             if owner_id is not None:
                 if user.id != owner_id:
-                    logger.warning(f"User {user.id} is not the owner")
-                    await update.message.reply_text("❌ Only the owner can execute this command.")
+                    logger.warning("User %s is not the owner", user.id)
+                    await _deny(update, context, _MSG_NOT_OWNER)
                     return
             else:
                 # Check if user is group creator
                 if chat:
                     try:
-                        member = await context.bot.get_chat_member(chat.id, user.id)
-                        if member.status != "creator":
-                            logger.warning(f"User {user.id} is not group creator in {chat.id}")
-                            await update.message.reply_text("❌ Only the group creator can execute this command.")
+                        status = await _get_member_status(context, chat.id, user.id)
+                        if status != "creator":
+                            logger.warning("User %s is not group creator in %s", user.id, chat.id)
+                            await _deny(update, context, _MSG_NOT_CREATOR)
                             return
                     except Exception as e:
-                        logger.error(f"Error verifying group creator: {e}")
-                        await update.message.reply_text("❌ Error verifying ownership.")
+                        logger.error("Error verifying group creator: %s", e)
+                        await _deny(update, context, _MSG_OWNER_ERROR)
                         return
             
-            logger.info(f"User {user.id} verified as owner")
+            logger.info("User %s verified as owner", user.id)
             return await func(update, context)
         
         return wrapper
@@ -315,6 +424,9 @@ def rate_limit(max_calls: int = 5, period: int = 60) -> Callable:
     """
     Decorator to rate limit user actions.
     
+    Uses a per-user token bucket: up to max_calls calls can be made at once,
+    and the allowance refills at max_calls per period.
+    
     Args:
         max_calls: Maximum number of calls allowed
         period: Time period in seconds
@@ -322,7 +434,11 @@ def rate_limit(max_calls: int = 5, period: int = 60) -> Callable:
     Returns:
         A decorator function
     """
+    refill_rate = max_calls / period
+    
     def decorator(func: Callable) -> Callable:
+        func_name = func.__name__
+        
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
             user = update.effective_user
@@ -331,29 +447,28 @@ def rate_limit(max_calls: int = 5, period: int = 60) -> Callable:
                 return
             
             # Initialize rate limit tracking
-            if "rate_limits" not in context.user_data:
-                context.user_data["rate_limits"] = {}
-            
-            func_name = func.__name__
-            now = __import__("time").time()
+            rate_limits = context.user_data.get("rate_limits")
+            if rate_limits is None:
+                rate_limits = context.user_data["rate_limits"] = {}
             
-            if func_name not in context.user_data["rate_limits"]:
-                context.user_data["rate_limits"][func_name] = []
+            now = monotonic()
             
-            # Remove old calls outside the period
-            calls = context.user_data["rate_limits"][func_name]
-            calls[:] = [call_time for call_time in calls if now - call_time < period]
+            # Token bucket stored as [tokens, last_refill], updated in place
+            bucket = rate_limits.get(func_name)
+            if bucket is None:
+                bucket = rate_limits[func_name] = [float(max_calls), now]
+            else:
+                bucket[0] = min(max_calls, bucket[0] + (now - bucket[1]) * refill_rate)
+                bucket[1] = now
             
             # Check if rate limit exceeded
-            if len(calls) >= max_calls:
-                logger.warning(f"Rate limit exceeded for user {user.id} on {func_name}")
-                await update.message.reply_text(
-                    f"⏳ You're sending too many requests. Please wait a moment."
-                )
+            if bucket[0] < 1:
+                logger.warning("Rate limit exceeded for user %s on %s", user.id, func_name)
+                await _deny(update, context, _MSG_RATE_LIMITED)
                 return
             
             # Record this call
-            calls.append(now)
+            bucket[0] -= 1
             return await func(update, context)
         
         return wrapper
@@ -370,18 +485,190 @@ def log_action(action_type: str = "action") -> Callable:
     Returns:
         A decorator function
     """
+    action_label = action_type.upper()
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
-            user = update.effective_user
-            chat = update.effective_chat
-            
-            logger.info(
-                f"[{action_type.upper()}] User: {user.id} ({user.username if user else 'Unknown'}) "
-                f"Chat: {chat.id if chat else 'Unknown'} Function: {func.__name__}"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                user = update.effective_user
+                chat = update.effective_chat
+                logger.info(
+                    "[%s] User: %s (%s) Chat: %s Function: %s",
+                    action_label,
+                    user.id if user else "Unknown",
+                    user.username if user else "Unknown",
+                    chat.id if chat else "Unknown",
+                    func.__name__,
+                )
             
             return await func(update, context)
         
         return wrapper
     return decorator
+
+
+def serialize_per_chat(func: Callable) -> Callable:
+    """
+    Decorator to run a handler one update at a time per chat.
+    
+    Updates from different chats still run concurrently; updates from the
+    same chat wait on a per-chat lock stored in bot_data["chat_locks"].
+    A chat's lock is dropped once no update for that chat holds or awaits it.
+    
+    Args:
+        func: The handler function to decorate
+        
+    Returns:
+        The decorated function
+    """
+    @wraps(func)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+        chat = update.effective_chat
+        
+        if not chat:
+            return await func(update, context)
+        
+        chat_locks = context.bot_data.get("chat_locks")
+        if chat_locks is None:
+            chat_locks = context.bot_data["chat_locks"] = {}
+        
+        # Each entry is [lock, number of updates holding or waiting for it]
+        entry = chat_locks.get(chat.id)
+        if entry is None:
+            entry = chat_locks[chat.id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        
+        try:
+            async with entry[0]:
+                return await func(update, context)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del chat_locks[chat.id]
+    
+    return wrapper
+
+
+def compose_guards(
+    auth: bool = False,
+    permission: Optional[str] = None,
+    rate: Optional[Tuple[int, int]] = None,
+    action: Optional[str] = None,
+) -> Callable:
+    """
+    Decorator combining several guards into a single generated wrapper.
+    
+    Equivalent to stacking require_authentication, require_permission,
+    log_action and rate_limit (in that order), but the enabled checks are
+    inlined into one function so each call runs a single wrapper frame.
+    
+    Args:
+        auth: Whether to require an authenticated user
+        permission: Optional permission string the user must have
+        rate: Optional (max_calls, period) rate limit
+        action: Optional action type to log for auditing
+        
+    Returns:
+        A decorator function
+    """
+    def decorator(func: Callable) -> Callable:
+        namespace: Dict[str, Any] = {
+            "func": func,
+            "func_name": func.__name__,
+            "logger": logger,
+            "logging": logging,
+            "monotonic": monotonic,
+            "_deny": _deny,
+            "AuthContext": AuthContext,
+            "_MD": _MD,
+            "_MSG_AUTH_FAIL": _MSG_AUTH_FAIL,
+            "_MSG_NOT_AUTHORIZED": _MSG_NOT_AUTHORIZED,
+            "_MSG_RATE_LIMITED": _MSG_RATE_LIMITED,
+        }
+        lines = [
+            "async def wrapper(update, context):",
+            "    user = update.effective_user",
+        ]
+        user_checked = False
+        
+        if auth:
+            lines += [
+                "    if not user:",
+                "        logger.warning('Authentication failed: No user object found')",
+                "        await _deny(update, context, _MSG_AUTH_FAIL)",
+                "        return",
+                "    auth = context.user_data.get('auth')",
+                "    if auth is None or auth.user_id != user.id or auth.username != user.username:",
+                "        context.user_data['auth'] = AuthContext(user.id, user.username)",
+                "    logger.debug('User %s (%s) authenticated successfully', user.id, user.username)",
+            ]
+            user_checked = True
+        
+        if permission is not None:
+            namespace["permission"] = permission
+            namespace["denied_msg"] = _MSG_NO_PERMISSION.format(permission)
+            if not user_checked:
+                lines += [
+                    "    if not user:",
+                    "        logger.warning('Permission check failed: No user object found')",
+                    "        await _deny(update, context, _MSG_NOT_AUTHORIZED)",
+                    "        return",
+                ]
+                user_checked = True
+            lines += [
+                "    if permission not in context.user_data.get('permissions', ()):",
+                "        logger.warning('User %s lacks required permission: %s', user.id, permission)",
+                "        await _deny(update, context, denied_msg, **_MD)",
+                "        return",
+                "    logger.info('User %s has permission: %s', user.id, permission)",
+            ]
+        
+        if action is not None:
+            namespace["action_label"] = action.upper()
+            lines += [
+                "    if logger.isEnabledFor(logging.INFO):",
+                "        chat = update.effective_chat",
+                "        logger.info(",
+                "            '[%s] User: %s (%s) Chat: %s Function: %s',",
+                "            action_label,",
+                "            user.id if user else 'Unknown',",
+                "            user.username if user else 'Unknown',",
+                "            chat.id if chat else 'Unknown',",
+                "            func_name,",
+                "        )",
+            ]
+        
+        if rate is not None:
+            max_calls, period = rate
+            namespace["max_calls"] = max_calls
+            namespace["refill_rate"] = max_calls / period
+            if not user_checked:
+                lines += [
+                    "    if not user:",
+                    "        return",
+                ]
+                user_checked = True
+            lines += [
+                "    rate_limits = context.user_data.get('rate_limits')",
+                "    if rate_limits is None:",
+                "        rate_limits = context.user_data['rate_limits'] = {}",
+                "    now = monotonic()",
+                "    bucket = rate_limits.get(func_name)",
+                "    if bucket is None:",
+                "        bucket = rate_limits[func_name] = [float(max_calls), now]",
+                "    else:",
+                "        bucket[0] = min(max_calls, bucket[0] + (now - bucket[1]) * refill_rate)",
+                "        bucket[1] = now",
+                "    if bucket[0] < 1:",
+                "        logger.warning('Rate limit exceeded for user %s on %s', user.id, func_name)",
+                "        await _deny(update, context, _MSG_RATE_LIMITED)",
+                "        return",
+                "    bucket[0] -= 1",
+            ]
+        
+        lines.append("    return await func(update, context)")
+        exec(compile("\n".join(lines), f"<guards for {func.__qualname__}>", "exec"), namespace)
+        return wraps(func)(namespace["wrapper"])
+    
+    return decorator
@@ -1,8 +1,12 @@
 """
 Inline keyboard builder functions for UI management.
 Provides utilities to construct and manage inline keyboards for Telegram bot interactions.
+
+Keyboards that depend only on their arguments are memoized; the returned
+InlineKeyboardMarkup objects are immutable and safe to share between messages.
 """
 
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
@@ -12,6 +16,8 @@ class KeyboardBuilder:
     Helper class to build inline keyboards for Telegram bot UI management.
     """
 
+    __slots__ = ("buttons",)
+
     def __init__(self):
         """Initialize an empty keyboard builder."""
         self.buttons: List[List[InlineKeyboardButton]] = []
@@ -26,6 +32,8 @@ class KeyboardBuilder:
         """
         Add a single button to the current row.
 
+        Use row() to start a new row.
+
         Args:
             text: Button display text
             callback_data: Callback query data for button interaction
@@ -41,7 +49,7 @@ class KeyboardBuilder:
             url=url,
             switch_inline_query=switch_inline_query,
         )
-        if not self.buttons or len(self.buttons[-1]) > 0:
+        if not self.buttons:
             self.buttons.append([])
         self.buttons[-1].append(button)
         return self
@@ -51,26 +59,26 @@ class KeyboardBuilder:
         buttons_data: List[Dict[str, str]],
     ) -> "KeyboardBuilder":
         """
-        Add multiple buttons in a single row.
+        Add multiple buttons as a complete row.
+
+        Buttons added afterwards start on a new row.
 
         Args:
-            buttons_data: List of button data dictionaries with keys:
-                         'text', 'callback_data', 'url', 'switch_inline_query'
+            buttons_data: List of button data dictionaries passed as keyword
+                         arguments to InlineKeyboardButton; 'text' is required,
+                         optional keys include 'callback_data', 'url' and
+                         'switch_inline_query'
 
         Returns:
             KeyboardBuilder: Self for method chaining
         """
-        row = []
-        for btn_data in buttons_data:
-            button = InlineKeyboardButton(
-                text=btn_data.get("text", ""),
-                callback_data=btn_data.get("callback_data"),
-                url=btn_data.get("url"),
-                switch_inline_query=btn_data.get("switch_inline_query"),
-            )
-            row.append(button)
+        row = [InlineKeyboardButton(**btn_data) for btn_data in buttons_data]
         if row:
-            self.buttons.append(row)
+            if self.buttons and not self.buttons[-1]:
+                self.buttons[-1] = row
+            else:
+                self.buttons.append(row)
+            self.buttons.append([])
         return self
 
     def row(self) -> "KeyboardBuilder":
@@ -91,7 +99,7 @@ class KeyboardBuilder:
         Returns:
             InlineKeyboardMarkup: The constructed inline keyboard
         """
-        return InlineKeyboardMarkup(inline_keyboard=self.buttons)
+        return InlineKeyboardMarkup(inline_keyboard=[row for row in self.buttons if row])
 
     def clear(self) -> "KeyboardBuilder":
         """
@@ -104,6 +112,18 @@ class KeyboardBuilder:
         return self
 
 
+@lru_cache(maxsize=1024)
+def _btn(text: str, callback_data: str) -> InlineKeyboardButton:
+    """
+    Return a shared InlineKeyboardButton for a fixed label and callback.
+
+    Only use this for buttons whose text and callback data are constants;
+    per-user or caller-supplied buttons should be built directly.
+    """
+    return InlineKeyboardButton(text, callback_data=callback_data)
+
+
+@lru_cache(maxsize=None)
 def create_main_menu_keyboard() -> InlineKeyboardMarkup:
     """
     Create the main menu keyboard.
@@ -111,14 +131,16 @@ def create_main_menu_keyboard() -> InlineKeyboardMarkup:
     Returns:
         InlineKeyboardMarkup: Main menu keyboard
     """
-    builder = KeyboardBuilder()
-    builder.add_button("📊 Statistics", callback_data="main_stats")
-    builder.row()
-    builder.add_button("👥 Members", callback_data="main_members")
-    builder.add_button("⚙️ Settings", callback_data="main_settings")
-    builder.row()
-    builder.add_button("❌ Close", callback_data="main_close")
-    return builder.build()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [_btn("📊 Statistics", "main_stats")],
+            [
+                _btn("👥 Members", "main_members"),
+                _btn("⚙️ Settings", "main_settings"),
+            ],
+            [_btn("❌ Close", "main_close")],
+        ]
+    )
 
 
 def create_group_selection_keyboard(groups: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
@@ -131,15 +153,17 @@ def create_group_selection_keyboard(groups: List[Dict[str, Any]]) -> InlineKeybo
     Returns:
         InlineKeyboardMarkup: Group selection keyboard
     """
-    builder = KeyboardBuilder()
-    for group in groups:
-        builder.add_button(
-            text=group.get("name", "Unknown"),
-            callback_data=f"group_{group.get('id', '')}",
-        )
-        builder.row()
-    builder.add_button("⬅️ Back", callback_data="back_to_main")
-    return builder.build()
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=group.get("name", "Unknown"),
+                callback_data=f"group_{group.get('id', '')}",
+            )
+        ]
+        for group in groups
+    ]
+    rows.append([_btn("⬅️ Back", "back_to_main")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def create_member_action_keyboard(user_id: int) -> InlineKeyboardMarkup:
@@ -152,15 +176,19 @@ def create_member_action_keyboard(user_id: int) -> InlineKeyboardMarkup:
     Returns:
         InlineKeyboardMarkup: Member action keyboard
     """
-    builder = KeyboardBuilder()
-    builder.add_button("🚫 Kick", callback_data=f"kick_{user_id}")
-    builder.add_button("🔇 Mute", callback_data=f"mute_{user_id}")
-    builder.row()
-    builder.add_button("📋 Info", callback_data=f"info_{user_id}")
-    builder.add_button("⚠️ Warn", callback_data=f"warn_{user_id}")
-    builder.row()
-    builder.add_button("⬅️ Back", callback_data="back_to_members")
-    return builder.build()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton("🚫 Kick", callback_data=f"kick_{user_id}"),
+                InlineKeyboardButton("🔇 Mute", callback_data=f"mute_{user_id}"),
+            ],
+            [
+                InlineKeyboardButton("📋 Info", callback_data=f"info_{user_id}"),
+                InlineKeyboardButton("⚠️ Warn", callback_data=f"warn_{user_id}"),
+            ],
+            [_btn("⬅️ Back", "back_to_members")],
+        ]
+    )
 
 
 def create_confirmation_keyboard(
@@ -177,12 +205,35 @@ def create_confirmation_keyboard(
     Returns:
         InlineKeyboardMarkup: Confirmation keyboard
     """
-    builder = KeyboardBuilder()
-    builder.add_button("✅ Confirm", callback_data=confirm_callback)
-    builder.add_button("❌ Cancel", callback_data=cancel_callback)
-    return builder.build()
+    return _confirmation_keyboard(confirm_callback, cancel_callback)
+
+
+@lru_cache(maxsize=256)
+def _confirmation_keyboard(confirm_callback: str, cancel_callback: str) -> InlineKeyboardMarkup:
+    """Return the shared confirmation keyboard for the given callbacks."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton("✅ Confirm", callback_data=confirm_callback),
+                InlineKeyboardButton("❌ Cancel", callback_data=cancel_callback),
+            ]
+        ]
+    )
+
+
+@lru_cache(maxsize=256)
+def _prev_button(base_callback: str) -> InlineKeyboardButton:
+    """Return the shared "Previous" pagination button for a callback base."""
+    return InlineKeyboardButton("⬅️ Previous", callback_data=f"{base_callback}_prev")
+
 
+@lru_cache(maxsize=256)
+def _next_button(base_callback: str) -> InlineKeyboardButton:
+    """Return the shared "Next" pagination button for a callback base."""
+    return InlineKeyboardButton("Next ➡️", callback_data=f"{base_callback}_next")
 
+
+@lru_cache(maxsize=256)
 def create_pagination_keyboard(
     page: int, total_pages: int, base_callback: str
 ) -> InlineKeyboardMarkup:
@@ -197,34 +248,20 @@ def create_pagination_keyboard(
     Returns:
         InlineKeyboardMarkup: Pagination keyboard
     """
-    builder = KeyboardBuilder()
-
     buttons = []
     if page > 1:
-        buttons.append(
-            {
-                "text": "⬅️ Previous",
-                "callback_data": f"{base_callback}_prev",
-            }
-        )
+        buttons.append(_prev_button(base_callback))
     buttons.append(
-        {
-            "text": f"📄 {page}/{total_pages}",
-            "callback_data": f"{base_callback}_info",
-        }
+        InlineKeyboardButton(
+            f"📄 {page}/{total_pages}", callback_data=f"{base_callback}_info"
+        )
     )
     if page < total_pages:
-        buttons.append(
-            {
-                "text": "Next ➡️",
-                "callback_data": f"{base_callback}_next",
-            }
-        )
-
-    builder.add_button_row(buttons)
-    return builder.build()
+        buttons.append(_next_button(base_callback))
+    return InlineKeyboardMarkup(inline_keyboard=[buttons])
 
 
+@lru_cache(maxsize=None)
 def create_settings_keyboard() -> InlineKeyboardMarkup:
     """
     Create a settings keyboard.
@@ -232,18 +269,20 @@ def create_settings_keyboard() -> InlineKeyboardMarkup:
     Returns:
         InlineKeyboardMarkup: Settings keyboard
     """
-    builder = KeyboardBuilder()
-    builder.add_button("🔐 Permissions", callback_data="settings_permissions")
-    builder.row()
-    builder.add_button("📝 Messages", callback_data="settings_messages")
-    builder.add_button("⏱️ Timers", callback_data="settings_timers")
-    builder.row()
-    builder.add_button("🎯 Rules", callback_data="settings_rules")
-    builder.row()
-    builder.add_button("⬅️ Back", callback_data="back_to_main")
-    return builder.build()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [_btn("🔐 Permissions", "settings_permissions")],
+            [
+                _btn("📝 Messages", "settings_messages"),
+                _btn("⏱️ Timers", "settings_timers"),
+            ],
+            [_btn("🎯 Rules", "settings_rules")],
+            [_btn("⬅️ Back", "back_to_main")],
+        ]
+    )
 
 
+@lru_cache(maxsize=256)
 def create_yes_no_keyboard(callback_prefix: str = "action") -> InlineKeyboardMarkup:
     """
     Create a simple yes/no keyboard.
@@ -254,12 +293,17 @@ def create_yes_no_keyboard(callback_prefix: str = "action") -> InlineKeyboardMar
     Returns:
         InlineKeyboardMarkup: Yes/No keyboard
     """
-    builder = KeyboardBuilder()
-    builder.add_button("✅ Yes", callback_data=f"{callback_prefix}_yes")
-    builder.add_button("❌ No", callback_data=f"{callback_prefix}_no")
-    return builder.build()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton("✅ Yes", callback_data=f"{callback_prefix}_yes"),
+                InlineKeyboardButton("❌ No", callback_data=f"{callback_prefix}_no"),
+            ]
+        ]
+    )
 
 
+@lru_cache(maxsize=256)
 def create_back_button(callback_data: str = "back_to_main") -> InlineKeyboardMarkup:
     """
     Create a simple back button keyboard.
@@ -270,9 +314,9 @@ def create_back_button(callback_data: str = "back_to_main") -> InlineKeyboardMar
     Returns:
         InlineKeyboardMarkup: Back button keyboard
     """
-    builder = KeyboardBuilder()
-    builder.add_button("⬅️ Back", callback_data=callback_data)
-    return builder.build()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton("⬅️ Back", callback_data=callback_data)]]
+    )
 
 
 def create_multi_action_keyboard(
@@ -289,12 +333,14 @@ def create_multi_action_keyboard(
     Returns:
         InlineKeyboardMarkup: Multi-action keyboard
     """
-    builder = KeyboardBuilder()
-    for i, action in enumerate(actions):
-        builder.add_button(
-            text=action.get("text", ""),
-            callback_data=action.get("callback_data", ""),
-        )
-        if (i + 1) % columns == 0:
-            builder.row()
-    return builder.build()
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=action.get("text", ""),
+                callback_data=action.get("callback_data", ""),
+            )
+            for action in actions[i:i + columns]
+        ]
+        for i in range(0, len(actions), columns)
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=rows)